@@ -10,14 +10,33 @@ TASK: Make a call to the API endpoint to get live information about astronauts i
 
 
 
-import requests
+import sys
+
+import http_client
 # from pprint import pprint as pp
 #
 endpoint1 = 'http://api.open-notify.org/astros.json'  # this endpoint returns data about astronauts currently in space
 
-response = requests.get(endpoint1) # making a call to the API
 
-print(response.status_code)  # make sure that your connection status code is 200, which means success!
+def get_http_client(use_requests=False):
+    # requests is only imported when asked for, because importing it takes longer
+    # than the call itself. http_client uses urllib.request from the standard library.
+    if use_requests:
+        import requests
+        return requests
+    return http_client
+
+
+def get_astronauts(client=http_client):
+    return client.get(endpoint1) # making a call to the API
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    client = get_http_client(use_requests='--requests' in argv)
+
+    response = get_astronauts(client)
+    print(response.status_code)  # make sure that your connection status code is 200, which means success!
 #
 # data = response.json()  # lets see what data about people in space we get back from the API response
 # pp(data)
@@ -30,6 +49,9 @@ print(response.status_code)  # make sure that your connection status code is 200
 # with open('file_handling_astronauts.txt', 'w') as text_file:
 #     for item in data['people']:
 #         text_file.write(item['name'] + '\n') # added new line character, so each name appears on a new line.
+#
+# # To keep the file up to date without rewriting it on every call, see astronaut_roster.py:
+# # RosterSync('file_handling_astronauts.txt', 'astronaut_events.log').poll()
 
 
 ### EXERCISE 2 ###
@@ -96,3 +118,10 @@ Write a log to the new file that captures time and ISS's location.
 #
 # # Write a log record to a file
 # # Run the program multiple times to get more records in the log
+#
+# # To analyse a long history of positions, save the raw numbers with
+# # iss_log.append_text_samples(path, [iss_log.sample_from_response(data)]) and see iss_log.py
+
+
+if __name__ == '__main__':
+    main()
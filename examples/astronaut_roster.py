@@ -0,0 +1,120 @@
+"""
+Astronaut roster sync
+
+The writer in api.py rewrites file_handling_astronauts.txt every time, one name at a time.
+RosterSync keeps the current roster as a sorted file (the 'snapshot') and remembers the
+names in a set and a sorted list. On every poll it works out who joined and who left,
+adds those changes to an event log with one write, and only rewrites the snapshot when
+something changed.
+The snapshot is written to a temporary file first and then renamed, so a reader never
+sees a half written roster.
+"""
+import bisect
+import os
+import stat
+import tempfile
+import time
+
+import http_client
+
+ASTROS_ENDPOINT = 'http://api.open-notify.org/astros.json'
+
+
+class RosterChanges:
+
+    def __init__(self, joined, left):
+        self.joined = joined
+        self.left = left
+
+    def __bool__(self):
+        return bool(self.joined or self.left)
+
+    def __repr__(self):
+        return 'RosterChanges(joined={!r}, left={!r})'.format(self.joined, self.left)
+
+
+class RosterSync:
+
+    def __init__(self, snapshot_path, events_path):
+        self.snapshot_path = snapshot_path
+        self.events_path = events_path
+        self.sorted_names = load_snapshot(snapshot_path)
+        self.names = set(self.sorted_names)
+        # the API usually sends exactly the same list as last time, and comparing
+        # two lists is much quicker than building a set to compare
+        self.last_names = None
+
+    def sync(self, names):
+        # Nothing in self is changed until both files are written, so if a write
+        # fails the same roster can be synced again and no events are lost.
+        # The snapshot goes first: if it fails no events are written, so a retry
+        # does not log the same changes twice.
+        received = list(names)
+        if received == self.last_names:
+            return RosterChanges(joined=[], left=[])
+
+        names = set(received)
+        changes = RosterChanges(joined=sorted(names - self.names), left=sorted(self.names - names))
+        if not changes:
+            self.last_names = received
+            return changes
+
+        # only a few names change, so a copy of the sorted list is updated instead of sorted again
+        sorted_names = list(self.sorted_names)
+        for name in changes.left:
+            del sorted_names[bisect.bisect_left(sorted_names, name)]
+        for name in changes.joined:
+            bisect.insort(sorted_names, name)
+
+        now = int(time.time())
+        events = [(now, 'joined', name) for name in changes.joined]
+        events += [(now, 'left', name) for name in changes.left]
+
+        write_snapshot(self.snapshot_path, sorted_names)
+        with open(self.events_path, 'a') as events_file:
+            events_file.write(''.join('{}\t{}\t{}\n'.format(*event) for event in events))
+
+        self.sorted_names = sorted_names
+        self.names = names
+        self.last_names = received
+        return changes
+
+    def poll(self, client=http_client, url=ASTROS_ENDPOINT):
+        return self.sync(fetch_astronaut_names(client, url))
+
+
+def fetch_astronaut_names(client=http_client, url=ASTROS_ENDPOINT):
+    response = client.get(url)
+    return [person['name'] for person in response.json()['people']]
+
+
+def load_snapshot(path):
+    # returns the names in sorted order, without duplicates
+    if not os.path.exists(path):
+        return []
+    with open(path) as snapshot_file:
+        return sorted({line.rstrip('\n') for line in snapshot_file if line.strip()})
+
+
+def write_snapshot(path, sorted_names):
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary_path = tempfile.mkstemp(dir=directory, prefix='.roster-')
+    try:
+        with os.fdopen(handle, 'w') as snapshot_file:
+            # mkstemp makes the file readable only by us, so give it the old file's mode
+            mode = stat.S_IMODE(os.stat(path).st_mode) if os.path.exists(path) else 0o644
+            os.fchmod(snapshot_file.fileno(), mode)
+            if sorted_names:
+                snapshot_file.write('\n'.join(sorted_names) + '\n')
+            # make sure the names are on disk before the rename, in case the machine crashes
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+if __name__ == '__main__':
+    roster = RosterSync('file_handling_astronauts.txt', 'astronaut_events.log')
+    print(roster.poll())
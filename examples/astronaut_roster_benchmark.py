@@ -0,0 +1,104 @@
+"""
+Benchmark for astronaut_roster.py
+
+A local HTTP server pretends to be Open Notify and serves astros.json with a very
+large made up roster. Most polls return the same roster; on some of them a few
+astronauts leave and a few join. We compare:
+    1. the api.py way: fetch, then rewrite the whole file one name at a time
+    2. RosterSync.poll: fetch, then write only the changes
+Both fetch the same JSON, so the difference is the file work. Polls with and
+without changes are timed separately.
+
+Usage: python astronaut_roster_benchmark.py [astronauts] [polls] [change_every]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import http_client
+from astronaut_roster import RosterSync, fetch_astronaut_names
+
+
+class StubOpenNotify(BaseHTTPRequestHandler):
+    body = b'{}'
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.end_headers()
+        self.wfile.write(self.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def set_roster(names):
+    people = [{'name': name, 'craft': 'ISS'} for name in names]
+    StubOpenNotify.body = json.dumps({'message': 'success', 'number': len(people), 'people': people}).encode()
+
+
+def rewrite_whole_file(url, path):
+    data = http_client.get(url).json()
+    with open(path, 'w') as text_file:
+        for item in data['people']:
+            text_file.write(item['name'] + '\n')
+
+
+def report(name, seconds, polls):
+    if polls:
+        print("{:<34} {:>8.1f} ms per poll".format(name, 1000 * seconds / polls))
+
+
+if __name__ == '__main__':
+    astronauts = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    polls = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    change_every = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    changes_per_poll = 10
+
+    server = HTTPServer(('127.0.0.1', 0), StubOpenNotify)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:{}/astros.json'.format(server.server_port)
+
+    with tempfile.TemporaryDirectory() as directory:
+        full_path = os.path.join(directory, 'full.txt')
+        roster = RosterSync(os.path.join(directory, 'roster.txt'), os.path.join(directory, 'events.log'))
+
+        # the first poll fills the snapshot, it is not part of the timing
+        first = 0
+        set_roster(['Astronaut {:07d}'.format(number) for number in range(first, first + astronauts)])
+        roster.poll(url=url)
+
+        # times[changed] = [fetch, rewrite, sync, number of polls]
+        times = {False: [0.0, 0.0, 0.0, 0], True: [0.0, 0.0, 0.0, 0]}
+        for poll in range(1, polls + 1):
+            changed = poll % change_every == 0
+            if changed:
+                first += changes_per_poll
+                set_roster(['Astronaut {:07d}'.format(number) for number in range(first, first + astronauts)])
+
+            start = time.perf_counter()
+            fetch_astronaut_names(url=url)
+            times[changed][0] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            rewrite_whole_file(url, full_path)
+            times[changed][1] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            roster.poll(url=url)
+            times[changed][2] += time.perf_counter() - start
+            times[changed][3] += 1
+
+    server.shutdown()
+    print("{} astronauts, {} polls, {} changes every {} polls".format(
+        astronauts, polls, 2 * changes_per_poll, change_every))
+    for changed, (fetch_time, rewrite_time, sync_time, count) in times.items():
+        label = "changed" if changed else "unchanged"
+        report("fetch only ({})".format(label), fetch_time, count)
+        report("rewrite whole file ({})".format(label), rewrite_time, count)
+        report("RosterSync.poll ({})".format(label), sync_time, count)
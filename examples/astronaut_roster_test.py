@@ -0,0 +1,123 @@
+import os
+import stat
+import tempfile
+from unittest import TestCase, main, mock
+
+import astronaut_roster
+from astronaut_roster import RosterSync, fetch_astronaut_names
+from file_handling_astronauts import count_uppercase
+
+
+class FakeResponse:
+    def __init__(self, names):
+        self.names = names
+
+    def json(self):
+        return {'message': 'success', 'people': [{'name': name, 'craft': 'ISS'} for name in self.names]}
+
+
+class FakeClient:
+    def __init__(self, names):
+        self.names = names
+
+    def get(self, url):
+        return FakeResponse(self.names)
+
+
+class TestRosterSync(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.snapshot_path = os.path.join(directory.name, 'roster.txt')
+        self.events_path = os.path.join(directory.name, 'events.log')
+
+    def read_lines(self, path):
+        with open(path) as text_file:
+            return text_file.read().splitlines()
+
+    def test_first_sync_writes_sorted_snapshot(self):
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        changes = roster.sync(['Worden, Alfred M.', 'Carpenter, M. Scott'])
+        self.assertEqual(['Carpenter, M. Scott', 'Worden, Alfred M.'], changes.joined)
+        self.assertEqual([], changes.left)
+        self.assertEqual(['Carpenter, M. Scott', 'Worden, Alfred M.'], self.read_lines(self.snapshot_path))
+        self.assertEqual(['joined\tCarpenter, M. Scott', 'joined\tWorden, Alfred M.'],
+                         [line.split('\t', 1)[1] for line in self.read_lines(self.events_path)])
+
+    def test_only_changes_are_logged(self):
+        RosterSync(self.snapshot_path, self.events_path).sync(['Anna', 'Bob'])
+        # a new RosterSync loads the snapshot from disk
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        changes = roster.poll(FakeClient(['Bob', 'Cleo']))
+        self.assertEqual(['Cleo'], changes.joined)
+        self.assertEqual(['Anna'], changes.left)
+        self.assertEqual(['Bob', 'Cleo'], self.read_lines(self.snapshot_path))
+        self.assertEqual(['joined\tAnna', 'joined\tBob', 'joined\tCleo', 'left\tAnna'],
+                         [line.split('\t', 1)[1] for line in self.read_lines(self.events_path)])
+
+    def test_unchanged_roster_does_not_touch_the_files(self):
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        roster.sync(['Anna', 'Bob'])
+        snapshot_details = os.stat(self.snapshot_path)
+        events_size = os.path.getsize(self.events_path)
+
+        changes = roster.sync(['Bob', 'Anna'])
+        self.assertFalse(changes)
+        self.assertEqual(snapshot_details, os.stat(self.snapshot_path))
+        self.assertEqual(events_size, os.path.getsize(self.events_path))
+
+    def test_failed_snapshot_write_can_be_retried(self):
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        roster.sync(['Anna', 'Bob'])
+        with mock.patch.object(astronaut_roster, 'write_snapshot', side_effect=OSError("disk full")):
+            with self.assertRaises(OSError):
+                roster.sync(['Bob', 'Cleo'])
+        self.assertEqual(['Anna', 'Bob'], self.read_lines(self.snapshot_path))
+
+        changes = roster.sync(['Bob', 'Cleo'])
+        self.assertEqual(['Cleo'], changes.joined)
+        self.assertEqual(['Anna'], changes.left)
+        self.assertEqual(['Bob', 'Cleo'], self.read_lines(self.snapshot_path))
+        # the failed attempt did not log anything, so every event is there once
+        self.assertEqual(['joined\tAnna', 'joined\tBob', 'joined\tCleo', 'left\tAnna'],
+                         [line.split('\t', 1)[1] for line in self.read_lines(self.events_path)])
+
+    def test_failed_event_write_can_be_retried(self):
+        roster = RosterSync(self.snapshot_path, os.path.join(os.path.dirname(self.events_path), 'missing', 'e.log'))
+        with self.assertRaises(OSError):
+            roster.sync(['Anna'])
+
+        roster.events_path = self.events_path
+        self.assertEqual(['Anna'], roster.sync(['Anna']).joined)
+        self.assertEqual(['Anna'], self.read_lines(self.snapshot_path))
+        self.assertEqual(['joined\tAnna'], [line.split('\t', 1)[1] for line in self.read_lines(self.events_path)])
+
+    def test_failed_chmod_closes_the_temporary_file(self):
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        with mock.patch.object(astronaut_roster.os, 'fchmod', side_effect=OSError("not allowed")):
+            with self.assertRaises(OSError):
+                roster.sync(['Anna'])
+        # the temporary file is closed and removed, and nothing else was written
+        self.assertEqual([], os.listdir(os.path.dirname(self.snapshot_path)))
+
+    def test_snapshot_keeps_its_file_mode(self):
+        with open(self.snapshot_path, 'w') as snapshot_file:
+            snapshot_file.write('Anna\n')
+        os.chmod(self.snapshot_path, 0o644)
+        RosterSync(self.snapshot_path, self.events_path).sync(['Anna', 'Bob'])
+        self.assertEqual(0o644, stat.S_IMODE(os.stat(self.snapshot_path).st_mode))
+
+    def test_uppercase_count_follows_the_snapshot(self):
+        roster = RosterSync(self.snapshot_path, self.events_path)
+        roster.sync(['Anna', 'Bob'])
+        self.assertEqual(2, count_uppercase(self.snapshot_path))
+        roster.sync(['Anna', 'Bob', 'Cleo McDonald'])
+        self.assertEqual(5, count_uppercase(self.snapshot_path))
+
+    def test_fetch_astronaut_names(self):
+        self.assertEqual(['Anna', 'Bob'], fetch_astronaut_names(FakeClient(['Anna', 'Bob'])))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""
+Buffered bulk output
+
+print() does one write per call, so printing a big triangle (Question 6 in week 2)
+or a long receipt spends most of its time in system calls instead of producing text.
+BufferedOutput collects the bytes into one reusable bytearray and only writes
+them out when the buffer is full (the 'flush threshold'), or hands a whole batch
+of rows to the operating system at once with os.writev.
+
+The bytearray mode is the one to use in most cases. With use_writev=True read-only
+rows are not copied at all: up to IOV_MAX of them are kept and written in one call,
+whatever their size. That only pays off when the rows are long and read-only, like
+the triangle's slices of one bytes object. Short rows, or rows in a bytearray that
+have to be copied anyway, are faster in the bytearray mode.
+"""
+import os
+import sys
+
+DEFAULT_FLUSH_THRESHOLD = 64 * 1024  # 64 KiB
+
+# the operating system limits how many pieces one writev call can take
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+if IOV_MAX <= 0:
+    IOV_MAX = 1024
+
+
+class BufferedOutput:
+
+    def __init__(self, target=None, flush_threshold=DEFAULT_FLUSH_THRESHOLD, use_writev=False):
+        if flush_threshold <= 0:
+            raise ValueError("flush_threshold should be bigger than zero")
+
+        # target is any binary file object, stdout by default
+        self.target = target if target is not None else sys.stdout.buffer
+        self.flush_threshold = flush_threshold
+
+        # writev needs a real file descriptor, otherwise we fall back to the bytearray
+        self.use_writev = use_writev and hasattr(os, 'writev') and _has_fileno(self.target)
+
+        # one buffer allocated up front and reused after every flush
+        self._buffer = bytearray(flush_threshold)
+        self._view = memoryview(self._buffer)
+        self._position = 0
+
+        # pending pieces for writev
+        self._pieces = []
+        self._pending = 0
+
+        self.bytes_written = 0
+
+    def write(self, data):
+        if self.use_writev:
+            self._add_piece(data)
+            return
+
+        size = memoryview(data).nbytes
+        if self._position + size > self.flush_threshold:
+            self.flush()
+        if size >= self.flush_threshold:
+            # too big for the buffer, so write it straight away
+            self._write_to_target(data)
+            return
+
+        self._view[self._position:self._position + size] = data
+        self._position += size
+
+    def write_line(self, *values, sep=' ', end='\n'):
+        # works like print(), but goes through the buffer
+        self.write((sep.join(str(value) for value in values) + end).encode())
+
+    def write_repeated(self, pattern, count, end=b'\n'):
+        # writes pattern * count followed by end, e.g. one row of the triangle
+        self.write(pattern * count)
+        if end:
+            self.write(end)
+
+    def flush(self):
+        if self.use_writev:
+            self._flush_pieces()
+        elif self._position:
+            self._write_to_target(self._view[:self._position])
+            self._position = 0
+        self.target.flush()
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _add_piece(self, data):
+        view = memoryview(data)
+        if not view.nbytes:
+            return
+        # pieces are only written at the next flush, so anything the caller could still
+        # change (a bytearray, say) is copied now, like the bytearray mode does.
+        # bytes and slices of bytes are read-only and are kept without copying.
+        if not view.readonly:
+            view = memoryview(bytes(view))
+            # only the copies take extra memory, so only they count towards the threshold
+            self._pending += view.nbytes
+        self._pieces.append(view.cast('B'))
+        if self._pending >= self.flush_threshold or len(self._pieces) >= IOV_MAX:
+            self._flush_pieces()
+
+    def _flush_pieces(self):
+        if not self._pieces:
+            return
+        # anything the file object buffered itself has to go out first
+        self.target.flush()
+        fd = self.target.fileno()
+        pieces = self._pieces
+        while pieces:
+            written = os.writev(fd, pieces)
+            self.bytes_written += written
+            # writev may stop part way, so drop what was written and try again
+            while pieces and written >= len(pieces[0]):
+                written -= len(pieces[0])
+                pieces.pop(0)
+            if written:
+                pieces[0] = pieces[0][written:]
+        self._pieces = []
+        self._pending = 0
+
+    def _write_to_target(self, data):
+        self.target.write(data)
+        self.bytes_written += len(data)
+
+
+def _has_fileno(stream):
+    try:
+        stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return False
+    return True
+
+
+def write_triangle(output, rows, character=b'o'):
+    # Question 6 from week 2: row n has n characters, starting from 0.
+    # The longest row is built once with bytes multiplication and every
+    # other row is a slice of it, so no new row strings are created.
+    if rows <= 0:
+        return
+    longest_row = memoryview(character * (rows - 1))
+    newline = b'\n'
+    for number in range(rows):
+        output.write(longest_row[:number * len(character)])
+        output.write(newline)
+
+
+if __name__ == '__main__':
+    with BufferedOutput() as output:
+        write_triangle(output, 100)
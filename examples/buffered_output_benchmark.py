@@ -0,0 +1,57 @@
+"""
+Benchmark for buffered_output.py
+
+Writes the 'o' triangle from week 2 (Question 6) to os.devnull in three ways
+and prints the speed in MB/s:
+    1. print() once per line, like the homework does
+    2. BufferedOutput with a reusable bytearray
+    3. BufferedOutput with os.writev
+
+Usage: python buffered_output_benchmark.py [rows]
+"""
+import os
+import sys
+import time
+
+from buffered_output import BufferedOutput, write_triangle
+
+
+def triangle_size(rows):
+    # 0 + 1 + ... + (rows - 1) characters, plus one newline per row
+    return rows * (rows - 1) // 2 + rows
+
+
+def print_triangle(rows, stream):
+    for number in range(rows):
+        print('o' * number, file=stream)
+
+
+def time_print(rows):
+    with open(os.devnull, 'w') as devnull:
+        start = time.perf_counter()
+        print_triangle(rows, devnull)
+        devnull.flush()
+        return time.perf_counter() - start
+
+
+def time_buffered(rows, use_writev):
+    with open(os.devnull, 'wb') as devnull:
+        start = time.perf_counter()
+        with BufferedOutput(devnull, use_writev=use_writev) as output:
+            write_triangle(output, rows)
+        return time.perf_counter() - start
+
+
+def report(name, rows, seconds):
+    megabytes = triangle_size(rows) / (1024 * 1024)
+    print("{:<22} {:>8.3f} s {:>10.1f} MB/s".format(name, seconds, megabytes / seconds))
+
+
+if __name__ == '__main__':
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print("Triangle with {} rows ({} bytes)".format(rows, triangle_size(rows)))
+
+    report("print per line", rows, time_print(rows))
+    report("BufferedOutput", rows, time_buffered(rows, use_writev=False))
+    if hasattr(os, 'writev'):
+        report("BufferedOutput writev", rows, time_buffered(rows, use_writev=True))
@@ -0,0 +1,89 @@
+import io
+import os
+import tempfile
+from array import array
+from unittest import TestCase, main
+
+from buffered_output import BufferedOutput, write_triangle
+
+
+def expected_triangle(rows):
+    return ''.join('o' * number + '\n' for number in range(rows)).encode()
+
+
+class TestBufferedOutput(TestCase):
+
+    def test_write_line_works_like_print(self):
+        target = io.BytesIO()
+        with BufferedOutput(target) as output:
+            output.write_line("Total:", 55.97, sep='\t')
+        self.assertEqual(b'Total:\t55.97\n', target.getvalue())
+
+    def test_nothing_is_written_before_the_threshold(self):
+        target = io.BytesIO()
+        output = BufferedOutput(target, flush_threshold=10)
+        output.write(b'abc')
+        self.assertEqual(b'', target.getvalue())
+        output.write(b'defghijk')
+        self.assertEqual(b'abc', target.getvalue())
+        output.flush()
+        self.assertEqual(b'abcdefghijk', target.getvalue())
+
+    def test_write_repeated(self):
+        target = io.BytesIO()
+        with BufferedOutput(target) as output:
+            output.write_repeated(b'o', 5)
+        self.assertEqual(b'ooooo\n', target.getvalue())
+
+    def test_triangle_with_small_buffer(self):
+        target = io.BytesIO()
+        with BufferedOutput(target, flush_threshold=7) as output:
+            write_triangle(output, 50)
+        self.assertEqual(expected_triangle(50), target.getvalue())
+
+    def test_triangle_with_writev(self):
+        if not hasattr(os, 'writev'):
+            self.skipTest("os.writev is not available")
+        with tempfile.TemporaryFile() as target:
+            with BufferedOutput(target, flush_threshold=100, use_writev=True) as output:
+                self.assertTrue(output.use_writev)
+                write_triangle(output, 200)
+            target.seek(0)
+            self.assertEqual(expected_triangle(200), target.read())
+
+    def test_reused_bytearray_gives_the_same_output_with_and_without_writev(self):
+        for use_writev in (False, True):
+            if use_writev and not hasattr(os, 'writev'):
+                continue
+            with tempfile.TemporaryFile() as target:
+                with BufferedOutput(target, use_writev=use_writev) as output:
+                    line = bytearray(b'aaa\n')
+                    output.write(line)
+                    line[:3] = b'bbb'
+                    output.write(line)
+                target.seek(0)
+                self.assertEqual(b'aaa\nbbb\n', target.read())
+
+    def test_sizes_are_counted_in_bytes(self):
+        for use_writev in (False, True):
+            if use_writev and not hasattr(os, 'writev'):
+                continue
+            with tempfile.TemporaryFile() as target:
+                numbers = array('i', [1, 2, 3])
+                with BufferedOutput(target, flush_threshold=8, use_writev=use_writev) as output:
+                    output.write(numbers)
+                    output.write(memoryview(numbers))
+                target.seek(0)
+                self.assertEqual(numbers.tobytes() * 2, target.read())
+
+    def test_writev_falls_back_without_file_descriptor(self):
+        output = BufferedOutput(io.BytesIO(), use_writev=True)
+        self.assertFalse(output.use_writev)
+
+    def test_threshold_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            BufferedOutput(io.BytesIO(), flush_threshold=0)
+
+
+if __name__ == '__main__':
+    main()
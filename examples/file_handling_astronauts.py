@@ -1,8 +1,28 @@
-with open('file_handling_astronauts.txt', 'r') as fh:
-    text = fh.read()
+import os
+
+# path -> (file details, count), so an unchanged file is not read again.
+# The roster snapshot is replaced by a new file whenever it changes (see astronaut_roster.py),
+# so the same inode, size and modification time mean the same names.
+_uppercase_counts = {}
+
+
+def count_uppercase(path):
+    details = os.stat(path)
+    key = (details.st_ino, details.st_size, details.st_mtime_ns)
+    cached = _uppercase_counts.get(path)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    with open(path, 'r') as fh:
+        text = fh.read()
 
     count = 0
     for letter in text:
         if letter.isupper():
             count += 1
-    print(count)
+    _uppercase_counts[path] = (key, count)
+    return count
+
+
+if __name__ == '__main__':
+    print(count_uppercase('file_handling_astronauts.txt'))
@@ -0,0 +1,43 @@
+"""
+Small HTTP client for single API calls
+
+'import requests' also loads urllib3, charset detection, certificates and more,
+which takes longer than one call to Open Notify. For a script that makes one or
+two calls, urllib.request from the standard library is enough.
+The response object has the parts of a requests response that the examples use:
+status_code, text and json().
+"""
+import json
+
+DEFAULT_TIMEOUT = 10  # seconds
+
+
+class SimpleResponse:
+
+    def __init__(self, url, status_code, content):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+def get(url, params=None, timeout=DEFAULT_TIMEOUT):
+    # urllib.request loads ssl, so it is imported on the first call and not at startup
+    import urllib.error
+    import urllib.parse
+    import urllib.request
+
+    if params:
+        url = url + ('&' if '?' in url else '?') + urllib.parse.urlencode(params)
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return SimpleResponse(url, response.status, response.read())
+    except urllib.error.HTTPError as error:
+        # like requests, an error status is returned instead of raised
+        return SimpleResponse(url, error.code, error.read())
@@ -0,0 +1,53 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest import TestCase, main
+
+import http_client
+
+
+class StubHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.startswith('/missing'):
+            self.send_response(404)
+            self.end_headers()
+            self.wfile.write(b'not found')
+            return
+        body = json.dumps({'path': self.path}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpClient(TestCase):
+
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), StubHandler)
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = 'http://127.0.0.1:{}'.format(self.server.server_port)
+
+    def test_get_json(self):
+        response = http_client.get(self.base_url + '/astros.json')
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({'path': '/astros.json'}, response.json())
+
+    def test_get_with_params(self):
+        response = http_client.get(self.base_url + '/iss-pass.json', params={'lat': 51.507, 'lon': 0.1278})
+        self.assertEqual({'path': '/iss-pass.json?lat=51.507&lon=0.1278'}, response.json())
+
+    def test_error_status_is_returned(self):
+        response = http_client.get(self.base_url + '/missing')
+        self.assertEqual(404, response.status_code)
+        self.assertEqual('not found', response.text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+ISS position log
+
+Exercise 3 in api.py writes one message per call to 'iss-now.json'. To look at
+months of positions we keep the raw numbers instead, one sample per line:
+    timestamp,latitude,longitude
+or the same three values as fixed size binary records (see SAMPLE_DTYPE).
+
+The whole log is loaded into NumPy columns in one go and every calculation works
+on all samples at once, instead of converting each timestamp with datetime in a loop.
+The binary log is opened with a memory map, so a huge history can be searched
+without reading all of it into memory.
+"""
+import os
+
+import numpy as np
+
+SAMPLE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),  # seconds since 1970, as returned by the API
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+])
+
+BUCKET_DTYPE = np.dtype([
+    ('start', 'datetime64[s]'),
+    ('count', '<i8'),
+    ('latitude', '<f8'),
+    ('longitude', '<f8'),
+    ('distance_km', '<f8'),
+])
+
+BUCKET_SECONDS = {
+    'minute': 60,
+    'hour': 60 * 60,
+    'day': 24 * 60 * 60,
+}
+
+EARTH_RADIUS_KM = 6371.0
+
+# The ISS goes round the Earth in about 92 minutes, so a straight line between two
+# samples further apart than this says nothing about the path it flew.
+DEFAULT_MAX_GAP_SECONDS = 5 * 60
+
+
+def sample_from_response(data):
+    # data is the JSON from http://api.open-notify.org/iss-now.json
+    position = data['iss_position']
+    return int(data['timestamp']), float(position['latitude']), float(position['longitude'])
+
+
+def append_text_samples(path, samples):
+    # all lines are joined first, so there is only one write
+    lines = ''.join('{},{},{}\n'.format(*sample) for sample in samples)
+    with open(path, 'a') as log_file:
+        log_file.write(lines)
+
+
+def append_binary_samples(path, samples):
+    records = np.array([tuple(sample) for sample in samples], dtype=SAMPLE_DTYPE)
+    with open(path, 'ab') as log_file:
+        records.tofile(log_file)
+
+
+def load_text_log(path):
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=SAMPLE_DTYPE)
+    return np.loadtxt(path, delimiter=',', dtype=SAMPLE_DTYPE, ndmin=1)
+
+
+def open_binary_log(path):
+    # nothing is read here, the operating system loads pages when they are used
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=SAMPLE_DTYPE)
+    return np.memmap(path, dtype=SAMPLE_DTYPE, mode='r')
+
+
+def convert_text_log(text_path, binary_path):
+    load_text_log(text_path).tofile(binary_path)
+
+
+def timestamps_as_datetime(samples):
+    return samples['timestamp'].astype('datetime64[s]')
+
+
+def samples_between(samples, start, end):
+    # start and end are datetime64 values or seconds since 1970, end is not included.
+    # The samples have to be in time order. A binary search only looks at a few records,
+    # so on a memory mapped log most of the file is never read.
+    timestamps = samples['timestamp']
+    first, last = np.searchsorted(timestamps, [_to_seconds(start), _to_seconds(end)], side='left')
+    return samples[first:max(first, last)]
+
+
+def haversine_km(latitude_1, longitude_1, latitude_2, longitude_2):
+    # great circle distance, works on single numbers or whole arrays
+    latitude_1, longitude_1, latitude_2, longitude_2 = (
+        np.radians(value) for value in (latitude_1, longitude_1, latitude_2, longitude_2)
+    )
+    a = (np.sin((latitude_2 - latitude_1) / 2) ** 2
+         + np.cos(latitude_1) * np.cos(latitude_2) * np.sin((longitude_2 - longitude_1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def ground_track_km(samples, max_gap_seconds=DEFAULT_MAX_GAP_SECONDS):
+    # distance between each sample and the next one, 0 where they are more than
+    # max_gap_seconds apart (None counts every step)
+    steps = haversine_km(samples['latitude'][:-1], samples['longitude'][:-1],
+                         samples['latitude'][1:], samples['longitude'][1:])
+    if max_gap_seconds is not None:
+        steps[np.diff(samples['timestamp']) > max_gap_seconds] = 0.0
+    return steps
+
+
+def ground_track_distance_km(samples, max_gap_seconds=DEFAULT_MAX_GAP_SECONDS):
+    return float(ground_track_km(samples, max_gap_seconds).sum())
+
+
+def bucket_mean_positions(samples, bucket='minute', max_gap_seconds=DEFAULT_MAX_GAP_SECONDS):
+    # Mean position and distance travelled for every minute/hour/day that has samples.
+    # The distance of a step is counted in the bucket where the step starts, and
+    # steps over a gap longer than max_gap_seconds are not counted (see ground_track_km).
+    if bucket not in BUCKET_SECONDS:
+        raise ValueError("bucket should be one of {}".format(list(BUCKET_SECONDS)))
+    if len(samples) == 0:
+        return np.empty(0, dtype=BUCKET_DTYPE)
+
+    timestamps = samples['timestamp']
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        samples = samples[np.argsort(timestamps, kind='stable')]
+        timestamps = samples['timestamp']
+
+    seconds = BUCKET_SECONDS[bucket]
+    bucket_numbers = timestamps // seconds
+    # samples are in time order, so every bucket is one block of samples next to each other
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket_numbers)) + 1))
+    counts = np.diff(np.append(starts, len(samples)))
+
+    # longitudes jump from 180 to -180, so they are averaged as directions
+    longitudes = np.radians(samples['longitude'])
+    mean_longitudes = np.degrees(np.arctan2(np.add.reduceat(np.sin(longitudes), starts),
+                                            np.add.reduceat(np.cos(longitudes), starts)))
+    steps = np.append(ground_track_km(samples, max_gap_seconds), 0.0)
+
+    result = np.empty(len(starts), dtype=BUCKET_DTYPE)
+    result['start'] = (bucket_numbers[starts] * seconds).astype('datetime64[s]')
+    result['count'] = counts
+    result['latitude'] = np.add.reduceat(samples['latitude'], starts) / counts
+    result['longitude'] = mean_longitudes
+    result['distance_km'] = np.add.reduceat(steps, starts)
+    return result
+
+
+def _to_seconds(value):
+    if isinstance(value, np.datetime64):
+        return int(value.astype('datetime64[s]').astype('int64'))
+    return int(value)
@@ -0,0 +1,76 @@
+"""
+Benchmark for iss_log.py
+
+Makes a synthetic log with one ISS position every 5 seconds and compares:
+    1. reading it line by line with datetime.fromtimestamp and averaging
+       the positions per minute in a dictionary
+    2. iss_log.load_text_log + bucket_mean_positions
+    3. iss_log.open_binary_log (memory map) + bucket_mean_positions
+
+Usage: python iss_log_benchmark.py [samples]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import iss_log
+
+
+def make_samples(count):
+    # roughly one orbit every 92 minutes, tilted 51.6 degrees like the ISS
+    timestamps = 1672531200 + 5 * np.arange(count, dtype=np.int64)
+    angle = 2 * np.pi * (timestamps - timestamps[0]) / (92 * 60)
+    samples = np.empty(count, dtype=iss_log.SAMPLE_DTYPE)
+    samples['timestamp'] = timestamps
+    samples['latitude'] = 51.6 * np.sin(angle)
+    samples['longitude'] = (np.degrees(angle) + 180) % 360 - 180
+    return samples
+
+
+def per_line_minute_means(path):
+    totals = {}
+    with open(path) as log_file:
+        for line in log_file:
+            timestamp, latitude, longitude = line.split(',')
+            minute = datetime.fromtimestamp(int(timestamp)).replace(second=0)
+            total = totals.setdefault(minute, [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += float(latitude)
+            total[2] += float(longitude)
+    return {minute: (lat / count, lon / count) for minute, (count, lat, lon) in totals.items()}
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, 'iss.log')
+        binary_path = os.path.join(directory, 'iss.bin')
+        samples = make_samples(count)
+        np.savetxt(text_path, samples, fmt=['%d', '%.4f', '%.4f'], delimiter=',')
+        samples.tofile(binary_path)
+
+        print("{} samples, {:.1f} MB text, {:.1f} MB binary".format(
+            count, os.path.getsize(text_path) / 1e6, os.path.getsize(binary_path) / 1e6))
+        print("{:<34} {:>8.3f} s".format(
+            "per line datetime.fromtimestamp", timed(per_line_minute_means, text_path)))
+        print("{:<34} {:>8.3f} s".format(
+            "load_text_log + buckets",
+            timed(lambda: iss_log.bucket_mean_positions(iss_log.load_text_log(text_path)))))
+        print("{:<34} {:>8.3f} s".format(
+            "open_binary_log + buckets",
+            timed(lambda: iss_log.bucket_mean_positions(iss_log.open_binary_log(binary_path)))))
+        print("{:<34} {:>8.3f} s".format(
+            "open_binary_log + one hour",
+            timed(lambda: iss_log.samples_between(iss_log.open_binary_log(binary_path),
+                                                   samples['timestamp'][count // 2],
+                                                   samples['timestamp'][count // 2] + 3600))))
@@ -0,0 +1,91 @@
+import os
+import tempfile
+from unittest import TestCase, main, skipIf
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if np is not None:
+    import iss_log
+
+
+@skipIf(np is None, "iss_log needs numpy")
+class TestIssLog(TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.text_path = os.path.join(directory.name, 'iss.log')
+        self.binary_path = os.path.join(directory.name, 'iss.bin')
+        # 12:00:00, 12:00:30, 12:01:10 and 13:00:00 on 1 Jan 2023
+        self.samples = [
+            (1672574400, 10.0, 179.0),
+            (1672574430, 12.0, -179.0),
+            (1672574470, 14.0, -177.0),
+            (1672578000, 0.0, 0.0),
+        ]
+        iss_log.append_text_samples(self.text_path, self.samples)
+
+    def test_sample_from_response(self):
+        data = {'timestamp': 1672574400, 'message': 'success',
+                'iss_position': {'latitude': '51.5', 'longitude': '-0.12'}}
+        self.assertEqual((1672574400, 51.5, -0.12), iss_log.sample_from_response(data))
+
+    def test_text_and_binary_logs_load_the_same_samples(self):
+        iss_log.convert_text_log(self.text_path, self.binary_path)
+        text_samples = iss_log.load_text_log(self.text_path)
+        binary_samples = iss_log.open_binary_log(self.binary_path)
+        self.assertEqual(4, len(binary_samples))
+        self.assertTrue(np.array_equal(text_samples, binary_samples))
+        self.assertEqual(np.datetime64('2023-01-01T12:00:30'), iss_log.timestamps_as_datetime(text_samples)[1])
+
+    def test_samples_between(self):
+        iss_log.append_binary_samples(self.binary_path, self.samples)
+        samples = iss_log.open_binary_log(self.binary_path)
+        selected = iss_log.samples_between(samples, np.datetime64('2023-01-01T12:00:30'), 1672578000)
+        self.assertEqual([1672574430, 1672574470], selected['timestamp'].tolist())
+
+    def test_haversine(self):
+        # a quarter of the way around the equator
+        self.assertAlmostEqual(2 * np.pi * iss_log.EARTH_RADIUS_KM / 4, iss_log.haversine_km(0, 0, 0, 90))
+
+    def test_bucket_mean_positions_per_minute(self):
+        buckets = iss_log.bucket_mean_positions(iss_log.load_text_log(self.text_path), 'minute')
+        self.assertEqual(3, len(buckets))
+        self.assertEqual([2, 1, 1], buckets['count'].tolist())
+        self.assertEqual(np.datetime64('2023-01-01T12:00:00'), buckets['start'][0])
+        self.assertAlmostEqual(11.0, buckets['latitude'][0])
+        # the mean of 179 and -179 is on the date line, not at 0
+        self.assertAlmostEqual(180.0, abs(buckets['longitude'][0]))
+        self.assertAlmostEqual(
+            iss_log.ground_track_distance_km(iss_log.load_text_log(self.text_path)),
+            buckets['distance_km'].sum())
+        # the 59 minute jump from 12:01:10 to 13:00:00 is a gap, not a distance
+        self.assertEqual(0.0, buckets['distance_km'][1])
+
+    def test_steps_over_a_gap_are_not_counted(self):
+        samples = iss_log.load_text_log(self.text_path)
+        steps = iss_log.ground_track_km(samples)
+        self.assertEqual(3, len(steps))
+        self.assertGreater(steps[0], 0)
+        self.assertGreater(steps[1], 0)
+        self.assertEqual(0.0, steps[2])
+        self.assertAlmostEqual(steps[0], iss_log.ground_track_km(samples, max_gap_seconds=30)[0])
+        self.assertEqual(0.0, iss_log.ground_track_km(samples, max_gap_seconds=30)[1])
+        # with no limit the gap is counted like any other step
+        self.assertGreater(iss_log.ground_track_km(samples, max_gap_seconds=None)[2], 0)
+
+    def test_bucket_mean_positions_per_hour(self):
+        samples = iss_log.load_text_log(self.text_path)[::-1]
+        buckets = iss_log.bucket_mean_positions(samples, 'hour')
+        self.assertEqual([3, 1], buckets['count'].tolist())
+
+    def test_unknown_bucket(self):
+        with self.assertRaises(ValueError):
+            iss_log.bucket_mean_positions(iss_log.load_text_log(self.text_path), 'week')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Startup benchmark
+
+Each entry point is imported in a fresh Python process, the same way a short
+command line run starts. For each one we print:
+    - the import time reported by 'python -X importtime' (in milliseconds)
+    - the wall-clock time of the whole process (best of a few runs)
+Importing the scripts must not call any API, so this also checks that they
+only do their work inside main().
+
+Usage: python startup_benchmark.py [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+EXAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+WEEK_3_DIR = os.path.join(EXAMPLES_DIR, '..', 'homework', 'week_3')
+
+# (name shown in the report, module to import, folder to run it from)
+ENTRY_POINTS = [
+    ('python (nothing)', None, EXAMPLES_DIR),
+    ('examples/api.py', 'api', EXAMPLES_DIR),
+    ('examples/http_client.py', 'http_client', EXAMPLES_DIR),
+    ('homework/week_3/week_3.py', 'week_3', WEEK_3_DIR),
+    ('urllib.request', 'urllib.request', EXAMPLES_DIR),
+    ('requests', 'requests', EXAMPLES_DIR),
+]
+
+
+def python_command(module):
+    code = 'import {}'.format(module) if module else 'pass'
+    return [sys.executable, '-c', code]
+
+
+def import_time_ms(module, folder):
+    # -X importtime writes one line per module to stderr:
+    # import time: self [us] | cumulative | imported package
+    if module is None:
+        return 0.0
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + python_command(module)[1:],
+                            cwd=folder, capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    return None
+
+
+def wall_clock_ms(module, folder, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(python_command(module), cwd=folder, capture_output=True)
+        times.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            return None
+    return min(times), statistics.median(times)
+
+
+if __name__ == '__main__':
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print("{:<28} {:>12} {:>12} {:>12}".format("entry point", "import ms", "best ms", "median ms"))
+    for name, module, folder in ENTRY_POINTS:
+        wall_clock = wall_clock_ms(module, folder, runs)
+        if wall_clock is None:
+            print("{:<28} could not be imported".format(name))
+            continue
+        import_ms = import_time_ms(module, folder)
+        import_text = '-' if import_ms is None else '{:.1f}'.format(import_ms)
+        print("{:<28} {:>12} {:>12.1f} {:>12.1f}".format(name, import_text, *wall_clock))
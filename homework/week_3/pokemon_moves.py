@@ -0,0 +1,238 @@
+"""
+Pokemon moves export
+
+Instead of writing 'name: move1, move2, ...,' lines that have to be parsed again,
+every response from PokeAPI is turned into three small tables:
+    pokemon        - id, name
+    moves          - id, name (each move name gets a number the first time we see it)
+    pokemon_moves  - pokemon_id, move_id (one row for every move a pokemon can learn)
+
+Rows are written as soon as a response arrives, so nothing piles up in memory.
+The tables are saved as JSON lines, or as Parquet files when pyarrow is installed.
+"""
+import importlib.util
+import json
+import os
+
+TABLES = ('pokemon', 'moves', 'pokemon_moves')
+
+
+class JsonLinesSink:
+    extension = '.jsonl'
+
+    def __init__(self, directory):
+        os.makedirs(directory, exist_ok=True)
+        # load_index prefers Parquet, so an older Parquet export must not be left behind
+        _remove_tables(directory, ParquetSink.extension)
+        self.files = {
+            table: open(os.path.join(directory, table + self.extension), 'w')
+            for table in TABLES
+        }
+
+    def write(self, table, row):
+        self.files[table].write(json.dumps(row) + '\n')
+
+    def close(self):
+        for table_file in self.files.values():
+            table_file.close()
+
+
+class ParquetSink:
+    extension = '.parquet'
+
+    def __init__(self, directory, batch_size=1000):
+        # pyarrow is slow to import, so it is only loaded when Parquet is really used
+        pyarrow = _import_pyarrow()
+        if pyarrow is None:
+            raise ImportError("ParquetSink needs pyarrow: pip install pyarrow")
+        self.pyarrow = pyarrow
+        os.makedirs(directory, exist_ok=True)
+        # only one export per folder, so an older JSON lines export is removed
+        _remove_tables(directory, JsonLinesSink.extension)
+        self.batch_size = batch_size
+        self.schemas = {
+            'pokemon': pyarrow.schema([('id', pyarrow.int64()), ('name', pyarrow.string())]),
+            'moves': pyarrow.schema([('id', pyarrow.int32()), ('name', pyarrow.string())]),
+            'pokemon_moves': pyarrow.schema([('pokemon_id', pyarrow.int64()), ('move_id', pyarrow.int32())]),
+        }
+        self.writers = {
+            table: pyarrow.parquet.ParquetWriter(os.path.join(directory, table + self.extension), schema)
+            for table, schema in self.schemas.items()
+        }
+        # rows are kept column by column until there are enough for one batch
+        self.columns = {table: {name: [] for name in schema.names} for table, schema in self.schemas.items()}
+
+    def write(self, table, row):
+        columns = self.columns[table]
+        for name, values in columns.items():
+            values.append(row[name])
+        if len(next(iter(columns.values()))) >= self.batch_size:
+            self._write_batch(table)
+
+    def close(self):
+        for table, writer in self.writers.items():
+            self._write_batch(table)
+            writer.close()
+
+    def _write_batch(self, table):
+        columns = self.columns[table]
+        if not next(iter(columns.values())):
+            return
+        batch = self.pyarrow.RecordBatch.from_pydict(columns, schema=self.schemas[table])
+        self.writers[table].write_batch(batch)
+        for values in columns.values():
+            values.clear()
+
+
+def _remove_tables(directory, extension):
+    for table in TABLES:
+        path = os.path.join(directory, table + extension)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        return None
+    return pyarrow
+
+
+def open_sink(directory, file_format='auto'):
+    if file_format == 'auto':
+        file_format = 'parquet' if importlib.util.find_spec('pyarrow') is not None else 'jsonl'
+    if file_format == 'parquet':
+        return ParquetSink(directory)
+    if file_format == 'jsonl':
+        return JsonLinesSink(directory)
+    raise ValueError("file_format should be one of 'auto', 'parquet', 'jsonl'")
+
+
+class PokemonMoveIndex:
+    # answers questions like 'which pokemon can learn this move?' without reading the files again
+
+    def __init__(self):
+        self.pokemon_names = {}
+        self.move_names = {}
+        self.move_ids = {}
+        self.pokemon_by_move = {}
+
+    def add_pokemon(self, pokemon_id, name):
+        self.pokemon_names[pokemon_id] = name
+
+    def add_move(self, move_id, name):
+        self.move_names[move_id] = name
+        self.move_ids[name] = move_id
+
+    def add_edge(self, pokemon_id, move_id):
+        self.pokemon_by_move.setdefault(move_id, set()).add(pokemon_id)
+
+    def pokemon_sharing_move(self, move_name):
+        move_id = self.move_ids.get(move_name)
+        if move_id is None:
+            return []
+        return sorted(self.pokemon_names[pokemon_id] for pokemon_id in self.pokemon_by_move.get(move_id, ()))
+
+
+class PokemonMoveExporter:
+
+    def __init__(self, sink, keep_index=True):
+        self.sink = sink
+        # move name -> move id, this is the dictionary encoding
+        self.move_ids = {}
+        # pokemon already written, so asking for the same id twice does not repeat its rows
+        self.pokemon_ids = set()
+        # the index grows with every pokemon, so it can be switched off for very big exports
+        self.index = PokemonMoveIndex() if keep_index else None
+
+    def add(self, pokemon):
+        # pokemon is the JSON from https://pokeapi.co/api/v2/pokemon/<id>/
+        pokemon_id = pokemon['id']
+        if pokemon_id in self.pokemon_ids:
+            return
+        self.pokemon_ids.add(pokemon_id)
+        self.sink.write('pokemon', {'id': pokemon_id, 'name': pokemon['name']})
+        if self.index is not None:
+            self.index.add_pokemon(pokemon_id, pokemon['name'])
+
+        for move in pokemon['moves']:
+            move_id = self._move_id(move['move']['name'])
+            self.sink.write('pokemon_moves', {'pokemon_id': pokemon_id, 'move_id': move_id})
+            if self.index is not None:
+                self.index.add_edge(pokemon_id, move_id)
+
+    def close(self):
+        self.sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _move_id(self, move_name):
+        move_id = self.move_ids.get(move_name)
+        if move_id is None:
+            move_id = len(self.move_ids)
+            self.move_ids[move_name] = move_id
+            self.sink.write('moves', {'id': move_id, 'name': move_name})
+            if self.index is not None:
+                self.index.add_move(move_id, move_name)
+        return move_id
+
+
+def fetch_pokemon(pokemon_ids, session=None):
+    # yields one response at a time, so each pokemon can be written before the next call
+    if session is None:
+        import requests
+        session = requests.Session()
+    for pokemon_id in pokemon_ids:
+        url = 'https://pokeapi.co/api/v2/pokemon/{}/'.format(pokemon_id)
+        response = session.get(url)
+        response.raise_for_status()
+        yield response.json()
+
+
+def export_pokemon_moves(pokemon_ids, directory, file_format='auto', session=None, keep_index=True):
+    # Returns the PokemonMoveIndex, or None with keep_index=False. Switch the index off
+    # for thousands of pokemon so memory stays flat, and use load_index later if needed.
+    with PokemonMoveExporter(open_sink(directory, file_format), keep_index=keep_index) as exporter:
+        for pokemon in fetch_pokemon(pokemon_ids, session):
+            exporter.add(pokemon)
+    return exporter.index
+
+
+def load_index(directory):
+    # rebuilds the index from a JSON lines or Parquet export
+    index = PokemonMoveIndex()
+    for row in _read_rows(directory, 'pokemon'):
+        index.add_pokemon(row['id'], row['name'])
+    for row in _read_rows(directory, 'moves'):
+        index.add_move(row['id'], row['name'])
+    for row in _read_rows(directory, 'pokemon_moves'):
+        index.add_edge(row['pokemon_id'], row['move_id'])
+    return index
+
+
+def _read_rows(directory, table):
+    if os.path.exists(os.path.join(directory, table + ParquetSink.extension)):
+        return _read_parquet(directory, table)
+    return _read_json_lines(directory, table)
+
+
+def _read_parquet(directory, table):
+    pyarrow = _import_pyarrow()
+    if pyarrow is None:
+        raise ImportError("Reading a Parquet export needs pyarrow: pip install pyarrow")
+    # one batch at a time, like the rows were written
+    parquet_file = pyarrow.parquet.ParquetFile(os.path.join(directory, table + ParquetSink.extension))
+    for batch in parquet_file.iter_batches():
+        yield from batch.to_pylist()
+
+
+def _read_json_lines(directory, table):
+    with open(os.path.join(directory, table + JsonLinesSink.extension)) as table_file:
+        for line in table_file:
+            yield json.loads(line)
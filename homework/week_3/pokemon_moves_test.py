@@ -0,0 +1,139 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, skipIf
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+from pokemon_moves import export_pokemon_moves, load_index
+
+
+def make_pokemon(pokemon_id, name, moves):
+    return {
+        'id': pokemon_id,
+        'name': name,
+        'moves': [{'move': {'name': move}} for move in moves],
+    }
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    def __init__(self, pokemon):
+        self.pokemon = {p['id']: p for p in pokemon}
+        self.urls = []
+
+    def get(self, url):
+        self.urls.append(url)
+        pokemon_id = int(url.rstrip('/').split('/')[-1])
+        return FakeResponse(self.pokemon[pokemon_id])
+
+
+class TestPokemonMoves(TestCase):
+    def setUp(self):
+        self.session = FakeSession([
+            make_pokemon(12, 'butterfree', ['gust', 'tackle']),
+            make_pokemon(21, 'spearow', ['gust', 'peck']),
+            make_pokemon(56, 'mankey', ['tackle']),
+        ])
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def read_table(self, table):
+        with open(os.path.join(self.directory.name, table + '.jsonl')) as table_file:
+            return [json.loads(line) for line in table_file]
+
+    def test_givenThreePokemon_whenExporting_thenMovesAreDictionaryEncoded(self):
+        export_pokemon_moves([12, 21, 56], self.directory.name, file_format='jsonl', session=self.session)
+
+        self.assertEqual(self.read_table('pokemon'), [
+            {'id': 12, 'name': 'butterfree'},
+            {'id': 21, 'name': 'spearow'},
+            {'id': 56, 'name': 'mankey'},
+        ])
+        self.assertEqual(self.read_table('moves'), [
+            {'id': 0, 'name': 'gust'},
+            {'id': 1, 'name': 'tackle'},
+            {'id': 2, 'name': 'peck'},
+        ])
+        self.assertEqual(self.read_table('pokemon_moves'), [
+            {'pokemon_id': 12, 'move_id': 0},
+            {'pokemon_id': 12, 'move_id': 1},
+            {'pokemon_id': 21, 'move_id': 0},
+            {'pokemon_id': 21, 'move_id': 2},
+            {'pokemon_id': 56, 'move_id': 1},
+        ])
+
+    def test_givenAMove_whenQueryingTheIndex_thenItReturnsPokemonSharingIt(self):
+        index = export_pokemon_moves([12, 21, 56], self.directory.name, file_format='jsonl', session=self.session)
+
+        self.assertEqual(index.pokemon_sharing_move('gust'), ['butterfree', 'spearow'])
+        self.assertEqual(index.pokemon_sharing_move('tackle'), ['butterfree', 'mankey'])
+        self.assertEqual(index.pokemon_sharing_move('surf'), [])
+
+    def test_givenAnExport_whenLoadingTheIndex_thenItMatchesTheExporterIndex(self):
+        export_pokemon_moves([12, 21, 56], self.directory.name, file_format='jsonl', session=self.session)
+
+        index = load_index(self.directory.name)
+        self.assertEqual(index.pokemon_sharing_move('peck'), ['spearow'])
+
+    def test_givenTheSamePokemonTwice_whenExporting_thenItsRowsAreWrittenOnce(self):
+        index = export_pokemon_moves([12, 12], self.directory.name, file_format='jsonl', session=self.session)
+
+        self.assertEqual(self.read_table('pokemon'), [{'id': 12, 'name': 'butterfree'}])
+        self.assertEqual(self.read_table('pokemon_moves'), [
+            {'pokemon_id': 12, 'move_id': 0},
+            {'pokemon_id': 12, 'move_id': 1},
+        ])
+        self.assertEqual(index.pokemon_sharing_move('gust'), ['butterfree'])
+
+    @skipIf(pyarrow is None, "Parquet export needs pyarrow")
+    def test_givenAParquetExport_whenLoadingTheIndex_thenItMatchesTheExporterIndex(self):
+        export_pokemon_moves([12, 21, 56], self.directory.name, file_format='parquet', session=self.session)
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory.name, 'pokemon_moves.parquet')))
+        index = load_index(self.directory.name)
+        self.assertEqual(index.pokemon_sharing_move('gust'), ['butterfree', 'spearow'])
+        self.assertEqual(index.pokemon_sharing_move('peck'), ['spearow'])
+        self.assertEqual(index.move_names, {0: 'gust', 1: 'tackle', 2: 'peck'})
+
+    @skipIf(pyarrow is None, "Parquet export needs pyarrow")
+    def test_givenAnOlderParquetExport_whenExportingJsonLines_thenLoadingReturnsTheNewData(self):
+        export_pokemon_moves([12], self.directory.name, file_format='parquet', session=self.session)
+        export_pokemon_moves([21], self.directory.name, file_format='jsonl', session=self.session)
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'pokemon.parquet')))
+        index = load_index(self.directory.name)
+        self.assertEqual(index.pokemon_names, {21: 'spearow'})
+
+    @skipIf(pyarrow is None, "Parquet export needs pyarrow")
+    def test_givenAnOlderJsonLinesExport_whenExportingParquet_thenTheJsonLinesFilesAreRemoved(self):
+        export_pokemon_moves([12], self.directory.name, file_format='jsonl', session=self.session)
+        export_pokemon_moves([21], self.directory.name, file_format='parquet', session=self.session)
+
+        self.assertFalse(os.path.exists(os.path.join(self.directory.name, 'pokemon.jsonl')))
+        self.assertEqual(load_index(self.directory.name).pokemon_names, {21: 'spearow'})
+
+    def test_givenKeepIndexOff_whenExporting_thenItReturnsNoneAndStillWritesTheTables(self):
+        index = export_pokemon_moves([12, 21], self.directory.name, file_format='jsonl', session=self.session,
+                                     keep_index=False)
+
+        self.assertIsNone(index)
+        self.assertEqual(len(self.read_table('pokemon_moves')), 4)
+        self.assertEqual(load_index(self.directory.name).pokemon_sharing_move('gust'), ['butterfree', 'spearow'])
+
+    def test_givenAnUnknownFormat_whenExporting_thenItRaisesValueError(self):
+        with self.assertRaises(ValueError):
+            export_pokemon_moves([12], self.directory.name, file_format='csv', session=self.session)
@@ -178,19 +178,19 @@
 
 # API
 # Question 1
-import requests
+# The moves are saved as pokemon / moves / pokemon_moves tables (see pokemon_moves.py)
+# instead of one comma separated line per pokemon.
+# requests and pyarrow are only imported when they are needed, so importing this
+# file is quick and does not call the API.
+from pokemon_moves import export_pokemon_moves
 
 pokemon_ids = [12, 56, 78, 45, 21, 65]
-with open('pokemon.txt', 'w') as pokemon_file:
-    for pokemon_id in pokemon_ids:
-        url = 'https://pokeapi.co/api/v2/pokemon/{}/'.format(pokemon_id)
-        response = requests.get(url)
-        pokemon_file.write(response.json()['name'] + ': ')
 
-        pokemon_moves = response.json()['moves']
 
-        for move in pokemon_moves:
-            pokemon_file.write(move['move']['name'])
-            pokemon_file.write(', ')
+def main():
+    pokemon_index = export_pokemon_moves(pokemon_ids, 'pokemon_data')
+    print(pokemon_index.pokemon_sharing_move('tackle'))
 
-        pokemon_file.write('\n')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,203 @@
+"""
+PIN service for the ATM
+
+PINs are never kept as plain numbers. Each card gets a random salt and we keep
+the PBKDF2 hash of salt + PIN. Checking a PIN hashes it again and compares the two
+hashes with hmac.compare_digest, which takes the same time whether the first or
+the last byte is wrong.
+
+After a correct PIN the terminal gets a session token. Tokens live in a small
+LRU cache with an expiry time, so the next operations on the same card only look
+up the token and do not hash again.
+
+Wrong attempts are counted per card in one array of bytes, and a card is blocked
+after MAX_ATTEMPTS wrong PINs in a row.
+
+A PIN is put into one standard form before hashing (see normalise_pin), so
+2846, '2846', ' 2846' and '02846' all match, like comparing int(pin) did.
+"""
+import asyncio
+import hashlib
+import hmac
+import os
+import secrets
+import time
+from array import array
+from collections import OrderedDict
+
+MAX_ATTEMPTS = 3
+SALT_SIZE = 16
+HASH_SIZE = 32  # sha256
+RECORD_SIZE = SALT_SIZE + HASH_SIZE
+# PBKDF2 is made slow on purpose. Lower it only for simulations with made up PINs.
+DEFAULT_ITERATIONS = 10_000
+DEFAULT_SESSION_SECONDS = 60
+DEFAULT_MAX_SESSIONS = 100_000
+BLOCKED_MESSAGE = "Invalid PIN {} times - unauthorised, so exiting".format(MAX_ATTEMPTS)
+
+
+class PinError(Exception):
+    pass
+
+
+class UnknownCard(PinError):
+    pass
+
+
+class IncorrectPin(PinError):
+    pass
+
+
+class CardBlocked(PinError):
+    pass
+
+
+def normalise_pin(pin):
+    # returns the PIN as a string without spaces or leading zeros, or None if it is not a number
+    pin = str(pin).strip()
+    if not (pin.isascii() and pin.isdigit()):
+        return None
+    return str(int(pin))
+
+
+def hash_pin(pin, salt, iterations=DEFAULT_ITERATIONS):
+    return hashlib.pbkdf2_hmac('sha256', str(pin).encode(), salt, iterations)
+
+
+class SessionCache:
+    # least recently used tokens are dropped first when the cache is full
+
+    def __init__(self, max_sessions=DEFAULT_MAX_SESSIONS, session_seconds=DEFAULT_SESSION_SECONDS,
+                 clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.session_seconds = session_seconds
+        self.clock = clock
+        self._sessions = OrderedDict()  # token -> (card number, expiry time)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def open(self, card_number):
+        token = secrets.token_hex(16)
+        self._sessions[token] = (card_number, self.clock() + self.session_seconds)
+        if len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return token
+
+    def check(self, token):
+        # returns the card number, or None if the token is unknown or expired
+        session = self._sessions.get(token)
+        if session is None:
+            return None
+        card_number, expires_at = session
+        if self.clock() >= expires_at:
+            del self._sessions[token]
+            return None
+        self._sessions.move_to_end(token)
+        return card_number
+
+    def close(self, token):
+        self._sessions.pop(token, None)
+
+
+class PinService:
+
+    def __init__(self, iterations=DEFAULT_ITERATIONS, sessions=None):
+        self.iterations = iterations
+        self.sessions = sessions if sessions is not None else SessionCache()
+        self._card_index = {}  # card number -> position in the tables below
+        self._records = bytearray()  # salt + hash for every card, RECORD_SIZE bytes each
+        self._attempts = array('B')  # wrong attempts in a row for every card
+
+    def __len__(self):
+        return len(self._card_index)
+
+    def add_card(self, card_number, pin):
+        pin = normalise_pin(pin)
+        if pin is None:
+            raise ValueError("A PIN should only contain digits")
+        salt = os.urandom(SALT_SIZE)
+        record = salt + hash_pin(pin, salt, self.iterations)
+        index = self._card_index.get(card_number)
+        if index is None:
+            self._card_index[card_number] = len(self._attempts)
+            self._records += record
+            self._attempts.append(0)
+        else:
+            self._records[index * RECORD_SIZE:(index + 1) * RECORD_SIZE] = record
+            self._attempts[index] = 0
+
+    def attempts_left(self, card_number):
+        return MAX_ATTEMPTS - self._attempts[self._index(card_number)]
+
+    def verify_pin(self, card_number, pin):
+        # returns a session token, or raises IncorrectPin / CardBlocked
+        pin, salt, expected = self.prepare(card_number, pin)
+        return self.finish(card_number, hash_pin(pin, salt, self.iterations), expected)
+
+    def prepare(self, card_number, pin):
+        # everything that has to happen before hashing: find the card, check it is not
+        # blocked and put the PIN in its standard form. Returns (pin, salt, expected hash).
+        index = self._index(card_number)
+        if self._attempts[index] >= MAX_ATTEMPTS:
+            raise CardBlocked(BLOCKED_MESSAGE)
+        normalised = normalise_pin(pin)
+        if normalised is None:
+            # not a number at all, which is a wrong attempt like any other
+            self.count_wrong_attempt(card_number)
+            raise IncorrectPin("PIN incorrect.")
+        record = self._records[index * RECORD_SIZE:(index + 1) * RECORD_SIZE]
+        return normalised, bytes(record[:SALT_SIZE]), bytes(record[SALT_SIZE:])
+
+    def finish(self, card_number, digest, expected):
+        # everything that has to happen after hashing: compare, count the attempt, open a session
+        index = self._index(card_number)
+        if self._attempts[index] >= MAX_ATTEMPTS:
+            raise CardBlocked(BLOCKED_MESSAGE)
+        if not hmac.compare_digest(digest, expected):
+            self.count_wrong_attempt(card_number)
+            raise IncorrectPin("PIN incorrect.")
+        self._attempts[index] = 0
+        return self.sessions.open(card_number)
+
+    def count_wrong_attempt(self, card_number):
+        # also used by the ATM when nothing was typed. The attempt that blocks the card
+        # is still reported as IncorrectPin; CardBlocked comes on the next try.
+        index = self._index(card_number)
+        if self._attempts[index] < MAX_ATTEMPTS:
+            self._attempts[index] += 1
+
+    def check_session(self, token):
+        return self.sessions.check(token)
+
+    def _index(self, card_number):
+        index = self._card_index.get(card_number)
+        if index is None:
+            raise UnknownCard("Unknown card {}".format(card_number))
+        return index
+
+
+class AsyncPinService:
+    # Front end for many terminals at once. Slow hashing runs in a thread pool
+    # (hashlib lets other threads run while it hashes), while the attempt
+    # table and the session cache are only changed on the event loop thread.
+    # With few iterations handing the hash to a thread costs more than the hash,
+    # so below inline_iterations it is done straight away on the event loop.
+
+    def __init__(self, service, executor=None, inline_iterations=1000):
+        self.service = service
+        self.executor = executor
+        self.inline_iterations = inline_iterations
+
+    async def verify_pin(self, card_number, pin):
+        pin, salt, expected = self.service.prepare(card_number, pin)
+        iterations = self.service.iterations
+        if iterations < self.inline_iterations:
+            digest = hash_pin(pin, salt, iterations)
+        else:
+            loop = asyncio.get_running_loop()
+            digest = await loop.run_in_executor(self.executor, hash_pin, pin, salt, iterations)
+        return self.service.finish(card_number, digest, expected)
+
+    async def check_session(self, token):
+        return self.service.check_session(token)
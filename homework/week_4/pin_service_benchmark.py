@@ -0,0 +1,71 @@
+"""
+Benchmark for pin_service.py
+
+Simulates a fleet of ATM terminals running at the same time with asyncio.
+Each terminal enters a PIN once (sometimes a wrong one first) and then does
+a few more operations with its session token, like an ATM asking for the
+balance and then a withdrawal. For the PIN checks and the session checks we
+print how many per second were done and the p99 latency.
+
+Usage: python pin_service_benchmark.py [terminals] [operations] [iterations]
+"""
+import asyncio
+import random
+import sys
+import time
+
+from pin_service import AsyncPinService, IncorrectPin, PinService
+
+
+def p99_ms(latencies):
+    latencies = sorted(latencies)
+    return 1000 * latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+
+
+async def terminal(front_end, card_number, pin, operations, pin_latencies, session_latencies):
+    if random.random() < 0.1:
+        start = time.perf_counter()
+        try:
+            await front_end.verify_pin(card_number, 'wrong')
+        except IncorrectPin:
+            pass
+        pin_latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    token = await front_end.verify_pin(card_number, pin)
+    pin_latencies.append(time.perf_counter() - start)
+
+    for _ in range(operations):
+        start = time.perf_counter()
+        await front_end.check_session(token)
+        session_latencies.append(time.perf_counter() - start)
+
+
+async def run_fleet(front_end, cards, operations):
+    pin_latencies = []
+    session_latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        terminal(front_end, card_number, pin, operations, pin_latencies, session_latencies)
+        for card_number, pin in cards
+    ))
+    return time.perf_counter() - start, pin_latencies, session_latencies
+
+
+if __name__ == '__main__':
+    terminals = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    operations = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    iterations = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+    service = PinService(iterations=iterations)
+    cards = [(number, '{:04d}'.format(random.randint(0, 9999))) for number in range(terminals)]
+    for card_number, pin in cards:
+        service.add_card(card_number, pin)
+
+    seconds, pin_latencies, session_latencies = asyncio.run(run_fleet(AsyncPinService(service), cards, operations))
+
+    print("{} terminals, {} operations each, PBKDF2 iterations: {}".format(terminals, operations, iterations))
+    print("{:<16} {:>10} {:>14}".format("", "per second", "p99 latency"))
+    print("{:<16} {:>10.0f} {:>11.3f} ms".format("PIN checks", len(pin_latencies) / seconds, p99_ms(pin_latencies)))
+    print("{:<16} {:>10.0f} {:>11.3f} ms".format(
+        "session checks", len(session_latencies) / seconds, p99_ms(session_latencies)))
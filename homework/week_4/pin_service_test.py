@@ -0,0 +1,112 @@
+import asyncio
+from unittest import TestCase
+
+from pin_service import (AsyncPinService, CardBlocked, IncorrectPin, PinService, SessionCache,
+                         UnknownCard)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPinService(TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.service = PinService(iterations=1, sessions=SessionCache(max_sessions=2, session_seconds=60,
+                                                                      clock=self.clock))
+        self.service.add_card('card-1', 2846)
+        self.service.add_card('card-2', '1234')
+
+    def test_givenTheCorrectPin_whenVerifying_thenItReturnsASessionForTheCard(self):
+        token = self.service.verify_pin('card-1', '2846')
+        self.assertEqual(self.service.check_session(token), 'card-1')
+
+    def test_givenAWrongPin_whenVerifying_thenItRaisesIncorrectPin(self):
+        with self.assertRaises(IncorrectPin):
+            self.service.verify_pin('card-1', '1111')
+        self.assertEqual(self.service.attempts_left('card-1'), 2)
+
+    def test_givenThreeWrongPins_whenVerifying_thenTheCardIsBlocked(self):
+        for _ in range(3):
+            with self.assertRaises(IncorrectPin):
+                self.service.verify_pin('card-1', '1111')
+        self.assertEqual(self.service.attempts_left('card-1'), 0)
+        with self.assertRaises(CardBlocked):
+            self.service.verify_pin('card-1', '2846')
+        # other cards are not affected
+        self.assertEqual(self.service.attempts_left('card-2'), 3)
+
+    def test_givenACorrectPinAfterAWrongOne_whenVerifying_thenAttemptsAreReset(self):
+        with self.assertRaises(IncorrectPin):
+            self.service.verify_pin('card-1', '1111')
+        self.service.verify_pin('card-1', '2846')
+        self.assertEqual(self.service.attempts_left('card-1'), 3)
+
+    def test_givenEmptyPins_whenCountingWrongAttempts_thenTheCardIsBlocked(self):
+        for _ in range(3):
+            self.service.count_wrong_attempt('card-1')
+        self.assertEqual(self.service.attempts_left('card-1'), 0)
+        with self.assertRaises(CardBlocked):
+            self.service.verify_pin('card-1', '2846')
+
+    def test_givenLeadingZerosOrSpaces_whenVerifying_thenThePinStillMatches(self):
+        for pin in ('02846', ' 2846 ', 2846):
+            self.assertEqual(self.service.check_session(self.service.verify_pin('card-1', pin)), 'card-1')
+
+    def test_givenAPinThatIsNotANumber_whenVerifying_thenItCountsAsAWrongAttempt(self):
+        with self.assertRaises(IncorrectPin):
+            self.service.verify_pin('card-1', '28a6')
+        self.assertEqual(self.service.attempts_left('card-1'), 2)
+
+    def test_givenAPinThatIsNotANumber_whenAddingACard_thenItRaisesValueError(self):
+        with self.assertRaises(ValueError):
+            self.service.add_card('card-3', 'abcd')
+
+    def test_givenAnUnknownCard_whenVerifying_thenItRaisesUnknownCard(self):
+        with self.assertRaises(UnknownCard):
+            self.service.verify_pin('card-3', '2846')
+
+    def test_givenAnExpiredSession_whenChecking_thenItReturnsNone(self):
+        token = self.service.verify_pin('card-1', '2846')
+        self.clock.now = 61
+        self.assertIsNone(self.service.check_session(token))
+
+    def test_givenAFullSessionCache_whenOpeningASession_thenTheLeastRecentlyUsedIsDropped(self):
+        first = self.service.verify_pin('card-1', '2846')
+        second = self.service.verify_pin('card-2', '1234')
+        self.service.check_session(first)
+        third = self.service.verify_pin('card-1', '2846')
+        self.assertEqual(self.service.check_session(first), 'card-1')
+        self.assertIsNone(self.service.check_session(second))
+        self.assertEqual(self.service.check_session(third), 'card-1')
+
+
+class TestAsyncPinService(TestCase):
+    def test_givenManyTerminals_whenVerifyingAtTheSameTime_thenEachGetsASession(self):
+        service = PinService(iterations=1)
+        for number in range(20):
+            service.add_card(number, number)
+        front_end = AsyncPinService(service)
+
+        async def run_terminals():
+            return await asyncio.gather(*(front_end.verify_pin(number, number) for number in range(20)))
+
+        tokens = asyncio.run(run_terminals())
+        self.assertEqual([service.check_session(token) for token in tokens], list(range(20)))
+
+    def test_givenSlowHashing_whenVerifyingAsync_thenItUsesTheThreadPool(self):
+        service = PinService(iterations=1000)
+        service.add_card('card-1', 2846)
+        front_end = AsyncPinService(service, inline_iterations=1000)
+        token = asyncio.run(front_end.verify_pin('card-1', '2846'))
+        self.assertEqual(service.check_session(token), 'card-1')
+
+    def test_givenAWrongPin_whenVerifyingAsync_thenItRaisesIncorrectPin(self):
+        service = PinService(iterations=1)
+        service.add_card('card-1', 2846)
+        with self.assertRaises(IncorrectPin):
+            asyncio.run(AsyncPinService(service).verify_pin('card-1', '0000'))
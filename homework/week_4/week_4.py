@@ -15,38 +15,47 @@ Tasks:
 
 """
 
-account_balance = 100
-correct_pin = 2846
-valid_pin = False
+from pin_service import BLOCKED_MESSAGE, CardBlocked, PinError, PinService
 
-for attempt in range(3):
-    user_pin_code = input("Enter your PIN: ")
-    try:
-        if not user_pin_code:
-            raise Exception("Please enter a PIN.")
-        if int(user_pin_code) != correct_pin:
-            raise Exception("PIN incorrect.")
-    except Exception as ex:
-        print(ex)
-    else:
-        valid_pin = True
-        break
+card_number = '4000 1234 5678 9010'
+pin_service = PinService()
+pin_service.add_card(card_number, 2846)  # only the salted hash of the PIN is kept
 
-if not valid_pin:
-    raise Exception("Invalid PIN 3 times - unauthorised, so exiting")
 
-requested_sum = 0
-while not requested_sum:
-    requested_sum = input("Introduced the sum you want to withdraw: ")
+def main():
+    account_balance = 100
+    session_token = None
 
-if int(requested_sum) < 0:
-    raise Exception("Cannot input negative numbers")
+    while session_token is None:
+        # spaces and leading zeros are ignored, like int() did before (see normalise_pin)
+        user_pin_code = input("Enter your PIN: ").strip()
+        try:
+            if not user_pin_code:
+                # an empty PIN still uses up one of the attempts
+                pin_service.count_wrong_attempt(card_number)
+                raise PinError("Please enter a PIN.")
+            session_token = pin_service.verify_pin(card_number, user_pin_code)
+        except PinError as ex:
+            print(ex)
+            if pin_service.attempts_left(card_number) == 0:
+                raise CardBlocked(BLOCKED_MESSAGE)
 
-if int(requested_sum) > account_balance:
-    raise Exception("Insufficient funds. Try different amount.")
+    requested_sum = 0
+    while not requested_sum:
+        requested_sum = input("Introduced the sum you want to withdraw: ")
 
-account_balance -= int(requested_sum)
-print(account_balance)
+    if int(requested_sum) < 0:
+        raise Exception("Cannot input negative numbers")
+
+    if int(requested_sum) > account_balance:
+        raise Exception("Insufficient funds. Try different amount.")
+
+    account_balance -= int(requested_sum)
+    print(account_balance)
+
+
+if __name__ == '__main__':
+    main()
 
 # from random import randint
 #
@@ -0,0 +1,43 @@
+import io
+from contextlib import redirect_stdout
+from unittest import TestCase, mock
+
+import week_4
+from pin_service import CardBlocked
+
+
+class TestAtm(TestCase):
+    def setUp(self):
+        # adding the card again resets its wrong attempts
+        week_4.pin_service.add_card(week_4.card_number, 2846)
+
+    def run_atm(self, *typed):
+        output = io.StringIO()
+        with mock.patch('builtins.input', side_effect=typed), redirect_stdout(output):
+            week_4.main()
+        return output.getvalue().splitlines()
+
+    def test_givenAPinWithLeadingZeros_whenWithdrawing_thenItIsAccepted(self):
+        self.assertEqual(self.run_atm('02846', '50'), ['50'])
+
+    def test_givenAPinWithSpacesAround_whenWithdrawing_thenItIsAccepted(self):
+        self.assertEqual(self.run_atm(' 2846 ', '30'), ['70'])
+
+    def test_givenAnEmptyPinThenAWrongOne_whenWithdrawing_thenTheThirdAttemptStillWorks(self):
+        self.assertEqual(self.run_atm('', '1111', '2846', '10'),
+                         ['Please enter a PIN.', 'PIN incorrect.', '90'])
+
+    def test_givenThreeWrongPins_whenWithdrawing_thenEveryMessageIsShownBeforeExiting(self):
+        output = io.StringIO()
+        with mock.patch('builtins.input', side_effect=['1111', 'abc', '']), redirect_stdout(output):
+            with self.assertRaises(CardBlocked):
+                week_4.main()
+        self.assertEqual(output.getvalue().splitlines(),
+                         ['PIN incorrect.', 'PIN incorrect.', 'Please enter a PIN.'])
+
+    def test_givenTheLastWrongPin_whenWithdrawing_thenPinIncorrectIsPrintedFirst(self):
+        output = io.StringIO()
+        with mock.patch('builtins.input', side_effect=['1111', '2222', '3333']), redirect_stdout(output):
+            with self.assertRaises(CardBlocked):
+                week_4.main()
+        self.assertEqual(output.getvalue().splitlines(), ['PIN incorrect.'] * 3)